@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from configparser import ConfigParser
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+_here = Path(__file__).parent
+
+
+@dataclass(frozen=True)
+class SpiggyConfig:
+    """
+    Immutable view of the settings in config/spiggy.ini.
+
+    The INI file is read and converted exactly once at import time, so
+    consumers get plain attribute access to pre-typed values instead of
+    going through ConfigParser section proxies in every module.
+
+    :ivar slash_command_guilds: Comma-separated guild IDs for slash commands.
+    :ivar aa_ideal_delay: Seconds after an API update to cache active auctions.
+    :ivar aa_cooldown: Seconds between active auctions caches.
+    :ivar aa_multiprocess: Whether to parse auction batches with
+    multiprocessing.
+    :ivar aa_batch_size: Batch size used in processing active auctions.
+    :ivar aa_mp_min_items: Minimum snapshot size before multiprocessing is
+    used.
+    :ivar aa_clear_threshold: Caches before the lowest BIN buffer is flushed.
+    :ivar ea_ideal_delay: Seconds after an API update to cache ended auctions.
+    :ivar ea_cooldown: Seconds between ended auctions caches.
+    :ivar ea_clear_threshold: Caches before the sale buffer is flushed.
+    :ivar bz_ideal_delay: Seconds after an API update to cache bazaar products.
+    :ivar bz_cooldown: Seconds between bazaar caches.
+    :ivar write_to_database: Whether the bot should modify the database.
+    :ivar default_plot_span: The default date span of plots, in days.
+    """
+    slash_command_guilds: str
+    aa_ideal_delay: float
+    aa_cooldown: float
+    aa_multiprocess: bool
+    aa_batch_size: int
+    aa_mp_min_items: int
+    aa_clear_threshold: int
+    ea_ideal_delay: Optional[float]
+    ea_cooldown: float
+    ea_clear_threshold: int
+    bz_ideal_delay: Optional[float]
+    bz_cooldown: float
+    write_to_database: bool
+    default_plot_span: int
+
+
+def _load_config() -> SpiggyConfig:
+    """
+    Read config/spiggy.ini and convert it into a SpiggyConfig instance.
+
+    :return: The parsed config.
+    """
+    cfg = ConfigParser()
+    cfg.read(_here.parent / 'config/spiggy.ini')
+
+    aa, ea, bz = cfg['Active Auctions'], cfg['Ended Auctions'], cfg['Bazaar']
+    return SpiggyConfig(
+        slash_command_guilds=cfg['Bot'].get('SlashCommandGuilds'),
+        aa_ideal_delay=aa.getfloat('IdealDelay'),
+        aa_cooldown=aa.getfloat('Cooldown'),
+        aa_multiprocess=aa.getboolean('Multiprocess'),
+        aa_batch_size=aa.getint('BatchSize'),
+        aa_mp_min_items=aa.getint('MultiprocessMinItems', fallback=5000),
+        aa_clear_threshold=aa.getint('ClearThreshold'),
+        ea_ideal_delay=ea.getfloat('IdealDelay'),
+        ea_cooldown=ea.getfloat('Cooldown'),
+        ea_clear_threshold=ea.getint('ClearThreshold'),
+        bz_ideal_delay=bz.getfloat('IdealDelay'),
+        bz_cooldown=bz.getfloat('Cooldown'),
+        write_to_database=cfg['Database'].getboolean('WriteToDatabase'),
+        default_plot_span=cfg['Plotting'].getint('DefaultPlotSpan')
+    )
+
+
+CONFIG = _load_config()
@@ -1,29 +1,55 @@
 import asyncio
-import inspect
+import atexit
 import logging
+from array import array
 from collections import defaultdict
-from configparser import ConfigParser
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from multiprocessing import Pool
 from pathlib import Path
-from typing import Awaitable, Callable, List, Literal, Optional, Tuple, Union
+from typing import Awaitable, Callable, List, Literal, Optional, \
+    Tuple, Union
 
+import numpy as np
+import orjson
+
+from backend.config import CONFIG
 from backend.controllers.skyblockapi import SkyblockAPI
 from models.auction import ActiveAuction, EndedAuction
 
-_here = Path(__file__).parent
-_cfg = ConfigParser()
-_cfg.read(_here.parent.parent / 'config/spiggy.ini')
+AA_COOLDOWN = CONFIG.aa_cooldown
+AA_MULTIPROCESS = CONFIG.aa_multiprocess
+AA_BATCH_SIZE = CONFIG.aa_batch_size
+AA_MP_MIN_ITEMS = CONFIG.aa_mp_min_items
+AA_CLEAR_THRESHOLD = CONFIG.aa_clear_threshold
+
+EA_COOLDOWN = CONFIG.ea_cooldown
+EA_CLEAR_THRESHOLD = CONFIG.ea_clear_threshold
 
-_aa_cfg = _cfg['Active Auctions']
-AA_COOLDOWN = _aa_cfg.getfloat('Cooldown')
-AA_MULTIPROCESS = _aa_cfg.getboolean('Multiprocess')
-AA_BATCH_SIZE = _aa_cfg.getint('BatchSize')
-AA_CLEAR_THRESHOLD = _aa_cfg.getint('ClearThreshold')
+# The Skyblock API refreshes its auction endpoints once a minute; polling is
+# anchored to this interval (plus a small buffer) rather than a blind cooldown
+API_UPDATE_INTERVAL = 60.0
+API_UPDATE_BUFFER = 2.0
 
-_ea_cfg = _cfg['Ended Auctions']
-EA_COOLDOWN = _ea_cfg.getfloat('Cooldown')
-EA_CLEAR_THRESHOLD = _ea_cfg.getint('ClearThreshold')
+
+def _poll_delay(last_update: Optional[datetime], cooldown: float) -> float:
+    """
+    Compute the number of seconds to sleep before the next cache attempt.
+
+    The next API update is expected one minute after the previous one, so
+    waiting until shortly after that point avoids polls which can only find
+    an already-cached snapshot. The configured cooldown acts as both the
+    fallback (no update seen yet) and the upper bound.
+
+    :param last_update: The timestamp of the last cached snapshot, if any.
+    :param cooldown: The configured cooldown between caches.
+    :return: The delay before the next cache attempt, in seconds.
+    """
+    if last_update is None:
+        return cooldown
+    next_expected = last_update + timedelta(
+        seconds=API_UPDATE_INTERVAL + API_UPDATE_BUFFER)
+    remaining = (next_expected - datetime.now()).total_seconds()
+    return min(cooldown, max(0.0, remaining))
 
 
 class AuctionHouse:
@@ -47,14 +73,17 @@ class AuctionHouse:
     api: SkyblockAPI
     active_auctions: List[ActiveAuction]
     ended_auctions: List[EndedAuction]
-    handlers: defaultdict[str, List[Union[Callable, Awaitable]]]
+    handlers: defaultdict[str, List[Tuple[Union[Callable, Awaitable], bool]]]
     aa_last_update: Optional[datetime]
     ea_last_update: Optional[datetime]
 
     aa_cache_count: int
     ea_cache_count: int
-    lbin_buffer: defaultdict[Tuple[str, str], List[float]]
-    sale_buffer: defaultdict[Tuple[str, str], List[float]]
+    lbin_buffer: defaultdict[Tuple[str, str], array]
+    sale_buffer: defaultdict[Tuple[str, str], array]
+    _executor: Optional[ProcessPoolExecutor]
+    _aa_columns: Optional[Tuple[np.ndarray, ...]]
+    _aa_keys: List[Tuple[str, str]]
 
     def __init__(self, api: SkyblockAPI) -> None:
         """
@@ -69,20 +98,82 @@ class AuctionHouse:
         self.aa_last_update, self.ea_last_update = None, None
 
         self.aa_cache_count, self.ea_cache_count = 0, 0
-        self.lbin_buffer = defaultdict(list)
-        self.sale_buffer = defaultdict(list)
+        # Prices are held unboxed in array('d') rather than lists of floats;
+        # doubles keep full precision for coin values, which overflow the
+        # float32 mantissa
+        self.lbin_buffer = defaultdict(lambda: array('d'))
+        self.sale_buffer = defaultdict(lambda: array('d'))
+        self._executor = None
+        self._aa_columns = None
+        self._aa_keys = []
+
+    def _build_aa_columns(self) -> None:
+        """
+        Build a structure-of-arrays view of the active auctions snapshot.
+
+        One pass over the snapshot fills parallel NumPy arrays with the
+        fields that buffer updates care about, so those updates can run as
+        vectorized array operations instead of per-auction Python loops. The
+        (item ID, rarity) pairs are factorized into integer codes, with
+        _aa_keys mapping each code back to its pair.
+
+        :return: None.
+        """
+        n = len(self.active_auctions)
+        key_codes = np.empty(n, dtype=np.int64)
+        unit_prices = np.empty(n, dtype=np.float64)
+        start_times = np.empty(n, dtype=np.int64)
+        is_bin = np.empty(n, dtype=bool)
+        codes: dict[Tuple[str, str], int] = {}
+        for i, auction in enumerate(self.active_auctions):
+            key = auction._key
+            code = codes.get(key)
+            if code is None:
+                code = codes.setdefault(key, len(codes))
+            key_codes[i] = code
+            unit_prices[i] = auction.unit_price
+            start_times[i] = auction._start_ms // 1000
+            is_bin[i] = auction.is_bin
+        self._aa_columns = (key_codes, unit_prices, start_times, is_bin)
+        self._aa_keys = list(codes)
+
+    def close(self) -> None:
+        """
+        Shut down the worker pool, if one was started.
+
+        :return: None.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     async def _emit(self, event: str) -> None:
         """
         Emit an event, calling all of the handlers associated with it.
 
+        Sync handlers (such as the database writers) are pushed to the
+        default thread executor so their blocking work doesn't stall the
+        event loop, and run to completion first: coroutine handlers like the
+        dashboard refresh read what the writers commit, so they must not
+        race the flush that triggered them. The coroutine handlers are then
+        gathered so handlers doing I/O overlap instead of running
+        back-to-back.
+
         :return: None.
         """
-        for handler in self.handlers[event]:
-            if inspect.iscoroutinefunction(handler):
-                await handler(self)
+        loop = asyncio.get_running_loop()
+        sync_futures = []
+        coroutine_handlers = []
+        for handler, is_coroutine in self.handlers[event]:
+            if is_coroutine:
+                coroutine_handlers.append(handler)
             else:
-                handler(self)
+                sync_futures.append(loop.run_in_executor(None, handler, self))
+        if sync_futures:
+            await asyncio.gather(*sync_futures)
+        if coroutine_handlers:
+            await asyncio.gather(*(handler(self)
+                                   for handler in coroutine_handlers))
 
     def on(self,
            event: Literal[
@@ -97,7 +188,10 @@ class AuctionHouse:
         :param handler: The handler to be added.
         :return: None.
         """
-        self.handlers[event].append(handler)
+        # Whether the handler is a coroutine function is decided here so that
+        # _emit doesn't have to re-inspect it on every event
+        self.handlers[event].append(
+            (handler, asyncio.iscoroutinefunction(handler)))
 
     async def cache_active_auctions(self) -> None:
         """
@@ -118,30 +212,47 @@ class AuctionHouse:
         # (Maybe) parse with multiprocessing
         logging.info('OK got proper snapshot')
         active_auctions = []
-        if AA_MULTIPROCESS:
-            # TODO use p.imap
-            with Pool() as p:
-                for batch_start in range(0, len(res), AA_BATCH_SIZE):
-                    batch_end = batch_start + AA_BATCH_SIZE
-                    ext = p.map(ActiveAuction, res[batch_start:batch_end])
-                    active_auctions.extend(ext)
-                    await asyncio.sleep(1)
+        # For small snapshots the pickle round-trip to the workers costs more
+        # than the parsing itself, so parse those inline regardless of the
+        # multiprocessing flag
+        if AA_MULTIPROCESS and len(res) >= AA_MP_MIN_ITEMS:
+            # The pool is created lazily and reused across caches so that
+            # worker startup isn't paid on every cycle
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor()
+                atexit.register(self.close)
+            loop = asyncio.get_running_loop()
+            # Submit every batch up front and consume results as they finish,
+            # so worker compute overlaps with parent-side collection instead
+            # of the batches running back-to-back. Batches cross the process
+            # boundary as orjson bytes, which pickle as a single buffer copy
+            # instead of a per-dict traversal
+            futures = [
+                loop.run_in_executor(self._executor,
+                                     ActiveAuction.from_json,
+                                     orjson.dumps(
+                                         res[batch_start:
+                                             batch_start + AA_BATCH_SIZE]))
+                for batch_start in range(0, len(res), AA_BATCH_SIZE)
+            ]
+            for future in asyncio.as_completed(futures):
+                # from_dicts already filters non-ASCII items in the worker,
+                # so rejects never cross the process boundary
+                active_auctions.extend(await future)
         else:
             for batch_start in range(0, len(res), AA_BATCH_SIZE):
                 batch_end = batch_start + AA_BATCH_SIZE
-                ext = [ActiveAuction(d)
-                       for d in res[batch_start:batch_end]]
+                ext = ActiveAuction.from_dicts(res[batch_start:batch_end])
                 active_auctions.extend(ext)
-                await asyncio.sleep(1)
-
-        # Parse and clean up
-        active_auctions = [auction for auction in active_auctions if
-                           auction.item.has_ascii_base_name()]
+                # Yield to the event loop between batches without adding
+                # wall-clock latency to the cache cycle
+                await asyncio.sleep(0)
 
         # Update instance variables
         self.active_auctions = active_auctions
         self.aa_last_update = last_update
         self.aa_cache_count += 1
+        self._build_aa_columns()
         await self.update_lbin_buffer()
 
         await self._emit('active auctions cache')
@@ -159,10 +270,10 @@ class AuctionHouse:
             logging.info('Snapshot already cached, moving on')
             return
 
-        # Parse and clean up
-        ended_auctions = [EndedAuction(d) for d in res]
-        ended_auctions = [auction for auction in ended_auctions if
-                          auction.item.has_ascii_base_name()]
+        # Parse and clean up in a single pass
+        ended_auctions = [auction for d in res
+                          if (auction :=
+                              EndedAuction(d)).item.has_ascii_base_name()]
 
         # Update instance variables
         self.ended_auctions = ended_auctions
@@ -190,7 +301,7 @@ class AuctionHouse:
         """
         while True:
             await self.cache_ended_auctions()
-            await asyncio.sleep(EA_COOLDOWN)
+            await asyncio.sleep(_poll_delay(self.ea_last_update, EA_COOLDOWN))
 
     async def start_caching(self) -> None:
         """
@@ -210,33 +321,29 @@ class AuctionHouse:
 
         :return: None.
         """
-        current_lbin = {}
-        minute = timedelta(minutes=1)
-
-        # Get current lowest BINs
-        for auction in self.active_auctions:
-            key = (auction.item.item_id, auction.item.rarity)
-            duration = self.aa_last_update - auction.start_time
-            if auction.is_bin and duration >= minute:
-                if key not in current_lbin:
-                    current_lbin[key] = auction.unit_price
-                else:
-                    current_lbin[key] = min(current_lbin[key],
-                                            auction.unit_price)
-
-        # Insert into the buffer
-        for key, price in current_lbin.items():
-            self.lbin_buffer[key].append(price)
+        # Vectorized group-min over the structure-of-arrays view built by
+        # cache_active_auctions: mask down to BINs at least a minute old,
+        # then take the per-key minimum with a single scatter instead of a
+        # Python loop
+        key_codes, unit_prices, start_times, is_bin = self._aa_columns
+        last_update_epoch = int(self.aa_last_update.timestamp())
+        mask = is_bin & (last_update_epoch - start_times >= 60)
+        mins = np.full(len(self._aa_keys), np.inf)
+        np.minimum.at(mins, key_codes[mask], unit_prices[mask])
+        for code in np.nonzero(mins != np.inf)[0]:
+            self.lbin_buffer[self._aa_keys[code]].append(float(mins[code]))
 
         # Maybe emit event and reset
         if self.aa_cache_count == AA_CLEAR_THRESHOLD:
             await self._emit('lbin buffer ready')
             self.aa_cache_count = 0
-            self.lbin_buffer = defaultdict(list)
+            # Clear in place to keep the already-sized hash table instead of
+            # allocating a fresh dict every threshold
+            self.lbin_buffer.clear()
             logging.info('OK Buffer cleared')
         else:
-            logging.info(f'OK Buffer updated '
-                         f'[{self.aa_cache_count}/{AA_CLEAR_THRESHOLD}]')
+            logging.info('OK Buffer updated [%d/%d]',
+                         self.aa_cache_count, AA_CLEAR_THRESHOLD)
 
     async def update_sale_buffer(self) -> None:
         """
@@ -245,18 +352,17 @@ class AuctionHouse:
         :return: None.
         """
         for auction in self.ended_auctions:
-            key = (auction.item.item_id, auction.item.rarity)
-            self.sale_buffer[key].append(auction.unit_price)
+            self.sale_buffer[auction._key].append(auction.unit_price)
 
         # Maybe emit event and reset
         if self.ea_cache_count == EA_CLEAR_THRESHOLD:
             await self._emit('sale buffer ready')
             self.ea_cache_count = 0
-            self.sale_buffer = defaultdict(list)
+            self.sale_buffer.clear()
             logging.info('OK Buffer cleared')
         else:
-            logging.info(f'OK Buffer updated '
-                         f'[{self.ea_cache_count}/{EA_CLEAR_THRESHOLD}]')
+            logging.info('OK Buffer updated [%d/%d]',
+                         self.ea_cache_count, EA_CLEAR_THRESHOLD)
 
 
 # Testing
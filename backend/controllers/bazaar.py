@@ -1,19 +1,14 @@
 import asyncio
-import inspect
 import logging
-from configparser import ConfigParser
 from datetime import datetime
 from pathlib import Path
-from typing import Awaitable, Callable, List, Optional, Union
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
 
+from backend.config import CONFIG
 from backend.controllers.skyblockapi import SkyblockAPI
 from models.bazaarproduct import BazaarProduct
 
-_here = Path(__file__).parent
-_cfg = ConfigParser()
-_cfg.read(_here.parent.parent / 'config/spiggy.ini')
-
-BZ_COOLDOWN = _cfg['Bazaar'].getfloat('Cooldown')
+BZ_COOLDOWN = CONFIG.bz_cooldown
 
 
 class Bazaar:
@@ -25,7 +20,7 @@ class Bazaar:
     """
     api: SkyblockAPI
     products: List[BazaarProduct]
-    _handlers: List[Union[Callable, Awaitable]]
+    _handlers: List[Tuple[Union[Callable, Awaitable], bool]]
     last_update: Optional[datetime]
 
     def __init__(self, api: SkyblockAPI) -> None:
@@ -54,8 +49,8 @@ class Bazaar:
         self.last_update = last_update
 
         # Notify the handlers
-        for func in self._handlers:
-            if inspect.iscoroutinefunction(func):
+        for func, is_coroutine in self._handlers:
+            if is_coroutine:
                 await func(last_update=self.last_update,
                            products=self.products)
             else:
@@ -69,7 +64,8 @@ class Bazaar:
         :param handler: The handler to be added.
         :return: None.
         """
-        self._handlers.append(handler)
+        self._handlers.append(
+            (handler, asyncio.iscoroutinefunction(handler)))
 
     async def start_caching(self) -> None:
         """
@@ -2,78 +2,67 @@ from __future__ import annotations
 
 import asyncio
 import functools
-import itertools
 import logging
-import math
-from collections import deque
-from configparser import ConfigParser
+import time
 from datetime import datetime, timedelta
-from json import JSONDecodeError
-from pathlib import Path
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import requests
-from aiohttp import ClientSession
+import orjson
+import yarl
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 
+from backend.config import CONFIG
 from backend.exceptions import ResponseCodeError, UnexpectedUpdateError
 
+AA_IDEAL_DELAY = CONFIG.aa_ideal_delay
+EA_IDEAL_DELAY = CONFIG.ea_ideal_delay
+BZ_IDEAL_DELAY = CONFIG.bz_ideal_delay
 
-_here = Path(__file__).parent
-_cfg = ConfigParser()
-_cfg.read(_here.parent.parent / 'config/spiggy.ini')
+# Hoisted so the snapshot loop doesn't rebuild the same timedelta each cycle
+AA_IDEAL_DELTA = timedelta(seconds=AA_IDEAL_DELAY)
 
-AA_IDEAL_DELAY = _cfg['Active Auctions'].getfloat('IdealDelay')
-EA_IDEAL_DELAY = _cfg['Ended Auctions'].getfloat('IdealDelay')
-BZ_IDEAL_DELAY = _cfg['Bazaar'].getfloat('IdealDelay')
+# Module logger; %-style arguments below are only formatted when the record
+# is actually emitted, so disabled levels cost nothing
+logger = logging.getLogger(__name__)
 
 
-def key_info_url(key: str) -> str:
-    """
-    Get the URL for the key endpoint with the key parameter filled in.
-
-    :param key: The given key.
-    :return: The corresponding URL.
-    """
-    return f'https://api.hypixel.net/key?key={key}'
-
-
-def active_auctions_url(page: int) -> str:
-    """
-    Get the URL for the active auctions endpoint with the page parameter filled
-    in.
-
-    :param page: The given page number.
-    :return: The corresponding URL.
-    """
-    return f'https://api.hypixel.net/skyblock/auctions?page={page}'
-
+# Endpoint URLs are parsed into yarl.URL objects once; per-request query
+# parameters go through the params fast path instead of re-parsing an
+# f-string URL for every page
+KEY_INFO_URL = yarl.URL('https://api.hypixel.net/key')
+ACTIVE_AUCTIONS_URL = yarl.URL('https://api.hypixel.net/skyblock/auctions')
+ENDED_AUCTIONS_URL = yarl.URL('https://api.hypixel.net/skyblock/auctions_ended')
+BAZAAR_URL = yarl.URL('https://api.hypixel.net/skyblock/bazaar')
 
-ENDED_AUCTIONS_URL = 'https://api.hypixel.net/skyblock/auctions_ended'
-BAZAAR_URL = 'https://api.hypixel.net/skyblock/bazaar'
+# The maximum number of simultaneous page requests; gathering every page at
+# once tends to trip Hypixel's burst limiting and lose the whole snapshot,
+# while keep-alive means a modest window costs almost no wall-clock time
+PAGE_CONCURRENCY = 16
 
 
 def use_key(req: Callable) -> Callable:
     """
     Decorator to rate-limit API calls over a one-minute window, uses the
-    "leaky bucket" technique.
+    "token bucket" technique.
+
+    The bucket holds at most `limit` tokens and refills continuously at
+    `limit` tokens per minute; each call consumes one. Keeping only the
+    token count and the last refill time makes scheduling O(1) per call,
+    and time.monotonic is immune to wall-clock jumps.
 
     :param req: The request to be wrapped.
     :return: The wrapped request.
     """
     @functools.wraps(req)
     async def wrapper(self, *args, **kwargs):
-        now = datetime.now()
-        minute = timedelta(minutes=1)
-
-        # Pop ones that are no longer in the minute window
-        while len(self.key_calls) and now - self.key_calls[0] > minute:
-            self.key_calls.popleft()
-
-        # Schedule the current request
-        scheduled_time = now if len(self.key_calls) < self.limit \
-            else self.key_calls[-self.limit] + minute
-        self.key_calls.append(scheduled_time)
-        await asyncio.sleep((scheduled_time - now).total_seconds())
+        now = time.monotonic()
+        self._tokens = min(float(self.limit),
+                           self._tokens + (now - self._last_refill)
+                           * self._rate)
+        self._last_refill = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self._rate)
         return await req(self, *args, **kwargs)
     return wrapper
 
@@ -88,38 +77,74 @@ class SkyblockAPI:
 
     :ivar _session: The session which is used for HTTPS requests.
     :ivar api_key: The API key to use for requests which require it.
-    :ivar key_calls: The timestamps of key-authenticated API calls from the
-    past minute.
     :ivar limit: The number of key-authenticated API calls allowed per minute.
+    :ivar _tokens: The number of key-authenticated calls currently available.
+    :ivar _rate: The token refill rate, in tokens per second.
+    :ivar _last_refill: The time.monotonic timestamp of the last refill.
     """
+    __slots__ = ('_session', '_page_semaphore', 'api_key', 'limit',
+                 '_tokens', '_rate', '_last_refill', '_last_update_ms',
+                 '_last_page_count')
+
     _session: ClientSession
+    _page_semaphore: asyncio.Semaphore
     api_key: str
-    key_calls: deque[datetime]
     limit: int
+    _tokens: float
+    _rate: float
+    _last_refill: float
+    _last_update_ms: Optional[int]
+    _last_page_count: Optional[int]
 
     def __init__(self, api_key: str):
         """
-        Construct an API wrapper instance from an API key.
+        Construct an API wrapper instance from an API key. The key is
+        validated against the API when the session is entered.
 
         :param api_key: A Hypixel API key.
         :return: None.
         """
         self.api_key = api_key
-        self.key_calls = deque()
-        res = requests.get(key_info_url(key=self.api_key))
-
-        body = res.json()
-        if not body['success']:
-            raise ValueError('Invalid Hypixel API key')
-        self.limit = body['record']['limit'] - 20
+        self._last_update_ms = None
+        self._last_page_count = None
 
     async def __aenter__(self) -> SkyblockAPI:
         """
-        Enter the session.
+        Enter the session and validate the API key.
+
+        The session is shared by every request made through the wrapper, so
+        page fetches reuse pooled connections instead of paying for a new
+        TCP/TLS handshake and DNS lookup each time. Validating the key here
+        (rather than with a blocking call in __init__) keeps construction
+        cheap and warms up the pooled connection for later requests.
 
         :return: None.
         """
-        self._session = ClientSession()
+        connector = TCPConnector(limit=PAGE_CONCURRENCY,
+                                 limit_per_host=PAGE_CONCURRENCY,
+                                 use_dns_cache=True, ttl_dns_cache=300,
+                                 keepalive_timeout=75,
+                                 enable_cleanup_closed=True)
+        # A bounded timeout turns a hung request into the normal retry path
+        # instead of stalling a snapshot indefinitely
+        self._session = ClientSession(connector=connector,
+                                      timeout=ClientTimeout(total=30,
+                                                            connect=5))
+        self._page_semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+        try:
+            url = KEY_INFO_URL.with_query(key=self.api_key)
+            async with self._session.get(url) as res:
+                body = orjson.loads(await res.read())
+            if not body['success']:
+                raise ValueError('Invalid Hypixel API key')
+        except BaseException:
+            await self._session.close()
+            raise
+        self.limit = body['record']['limit'] - 20
+        self._tokens = float(self.limit)
+        self._rate = self.limit / 60.0
+        self._last_refill = time.monotonic()
         return self
 
     async def __aexit__(self, *args) -> None:
@@ -138,69 +163,208 @@ class SkyblockAPI:
         :return: Pair containing the lastUpdated timestamp and the
         corresponding list of active auctions.
         """
-        logging.debug('Attempting to get active auctions snapshot')
-        page0_last_update: Optional[datetime] = None
-
-        # Coroutine to get a single page and raise an exception if something
-        # goes wrong
-        async def get_page(page: int) -> Dict[str, Any]:
-            async with self._session.get(active_auctions_url(page=page)) as res:
+        logger.debug('Attempting to get active auctions snapshot')
+        expected_update_ms: Optional[int] = None
+
+        # Coroutine to get the auctions on a single page and raise an
+        # exception if something goes wrong. Only the auctions array (plus
+        # the page metadata) outlives the page scope; the rest of the page
+        # wrapper becomes garbage here instead of being held until every
+        # page has arrived
+        async def get_page(page: int) \
+                -> Tuple[int, int, List[Dict[str, Any]]]:
+            nonlocal expected_update_ms
+            async with self._page_semaphore, \
+                    self._session.get(ACTIVE_AUCTIONS_URL,
+                                      params={'page': page}) as res:
                 if res.status != 200:
                     raise ResponseCodeError
-                body = await res.json()
-                last_update = datetime.fromtimestamp(body['lastUpdated'] / 1000)
-                if (page0_last_update is not None
-                        and last_update != page0_last_update):
+                # Parse inline, as the page 0 probe does: orjson holds the
+                # GIL for the whole call, so an executor hop would only add
+                # a thread round-trip per page without any parse overlap
+                body = orjson.loads(await res.read())
+                # Compare the raw millisecond timestamps; a datetime is only
+                # built on the failure path for the error message
+                last_update_ms = body['lastUpdated']
+                if expected_update_ms is None:
+                    # The probe was skipped, so the first page to arrive
+                    # anchors the snapshot; it must still be newer than the
+                    # previous one
+                    if (self._last_update_ms is not None
+                            and last_update_ms <= self._last_update_ms):
+                        raise UnexpectedUpdateError(
+                            'Predicted snapshot has not been published yet')
+                    expected_update_ms = last_update_ms
+                elif last_update_ms != expected_update_ms:
+                    expected = datetime.fromtimestamp(expected_update_ms
+                                                      / 1000)
+                    got = datetime.fromtimestamp(last_update_ms / 1000)
                     msg = f'Expected ' \
-                          f'{page0_last_update.strftime("%-I:%M:%S %p")} but ' \
-                          f'got {last_update.strftime("%-I:%M:%S %p")} on ' \
+                          f'{expected.strftime("%-I:%M:%S %p")} but ' \
+                          f'got {got.strftime("%-I:%M:%S %p")} on ' \
                           f'page {page}'
                     raise UnexpectedUpdateError(msg)
-                return body
+                return page, body['totalPages'], body['auctions']
+
+        # Fetch every page while keeping at most PAGE_CONCURRENCY tasks
+        # alive; gather would instantiate a task (frame and all) per page up
+        # front. Pages come back in completion order, which is fine since
+        # the snapshot is flattened into one unordered list anyway.
+        # page_count is only a scheduling estimate (the probe or the
+        # previous snapshot may be a minute stale); the first page to arrive
+        # carries the authoritative totalPages, which grows or shrinks the
+        # remaining work to match. Page counts routinely drift between
+        # snapshots, so only a lastUpdated mismatch aborts the attempt
+        async def get_pages(page_count: int) \
+                -> Tuple[List[List[Dict[str, Any]]], int]:
+            actual_count: Optional[int] = None
+            next_page = 0
+            pending: Dict[asyncio.Future, int] = {}
+
+            def schedule(limit: int) -> None:
+                nonlocal next_page
+                while next_page < limit and len(pending) < PAGE_CONCURRENCY:
+                    task = asyncio.ensure_future(get_page(next_page))
+                    pending[task] = next_page
+                    next_page += 1
+
+            schedule(page_count)
+            pages = []
+            try:
+                while pending:
+                    done, _ = await asyncio.wait(
+                        list(pending), return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        page, total_pages, auctions = task.result()
+                        # pop with a default: the shrink sweep below may
+                        # already have dropped a task that finished in this
+                        # same batch
+                        pending.pop(task, None)
+                        if actual_count is None:
+                            actual_count = total_pages
+                            # The estimate overshot; drop in-flight fetches
+                            # past the real end of the snapshot
+                            for t, p in list(pending.items()):
+                                if p >= actual_count:
+                                    t.cancel()
+                                    del pending[t]
+                        if page < actual_count:
+                            pages.append(auctions)
+                    schedule(actual_count if actual_count is not None
+                             else page_count)
+            except BaseException:
+                for task in pending:
+                    task.cancel()
+                raise
+            return pages, (actual_count if actual_count is not None
+                           else page_count)
+
+        # Retry with a loop rather than recursion so a flaky API window
+        # doesn't pin the locals of every failed attempt in a coroutine chain
+        while True:
+            expected_update_ms = None
+
+            # On the common minute-over-minute path the next update time and
+            # page count can be predicted from the previous snapshot, so the
+            # page 0 probe (a full HTTP round-trip) is skipped and the first
+            # gathered page anchors the timestamp check instead
+            if self._last_update_ms is not None:
+                predicted = datetime.fromtimestamp(
+                    (self._last_update_ms + 60_000) / 1000)
+                predicted_ideal = predicted + AA_IDEAL_DELTA
+                now_time = datetime.now()
+                if predicted_ideal > now_time:
+                    page_count = self._last_page_count
+                    logger.info(
+                        'Waiting until predicted ideal time %s '
+                        '(page 0 probe skipped)', predicted_ideal)
+                    await asyncio.sleep(
+                        (predicted_ideal - now_time).total_seconds())
+                    try:
+                        pages, page_count = await get_pages(page_count)
+                        return self._assemble_snapshot(expected_update_ms,
+                                                       pages, page_count)
+                    except (ResponseCodeError, UnexpectedUpdateError,
+                            asyncio.TimeoutError):
+                        logger.exception('FAIL Could not get predicted '
+                                          'snapshot, falling back to probe '
+                                          'in 30 seconds')
+                        await asyncio.sleep(30)
+                        continue
+
+            # Get the page count and the page 0 lastUpdated field
+            try:
+                async with self._session.get(ACTIVE_AUCTIONS_URL,
+                                             params={'page': 0}) as res:
+                    if res.status != 200:
+                        raise ResponseCodeError
+                    page0 = orjson.loads(await res.read())
+                page_count = page0['totalPages']
+                last_ms = page0['lastUpdated']
+                del page0
+            except (ResponseCodeError, UnexpectedUpdateError,
+                    asyncio.TimeoutError):
+                logger.exception('FAIL Could not get page 0, will try '
+                                  'again in 30 seconds')
+                await asyncio.sleep(30)
+                continue
+
+            # Wait until ideal time, working in integer milliseconds;
+            # snapshots align on 60-second boundaries, so if the ideal time
+            # has already passed, target the next minute's snapshot
+            ideal_ms = last_ms + round(AA_IDEAL_DELAY * 1000)
+            now_ms = round(time.time() * 1000)
+            if now_ms > ideal_ms:
+                k = (now_ms - ideal_ms + 59_999) // 60_000
+                last_ms += k * 60_000
+                ideal_ms += k * 60_000
+            logger.info('Waiting until next ideal time %s to capture '
+                        'snapshot with timestamp %s',
+                        datetime.fromtimestamp(ideal_ms / 1000),
+                        datetime.fromtimestamp(last_ms / 1000))
+            await asyncio.sleep(max(0.0, (ideal_ms - now_ms) / 1000))
+
+            # Get a snapshot
+            expected_update_ms = last_ms
+            try:
+                pages, page_count = await get_pages(page_count)
+                return self._assemble_snapshot(expected_update_ms, pages,
+                                               page_count)
+            except (ResponseCodeError, UnexpectedUpdateError,
+                    asyncio.TimeoutError):
+                logger.exception('FAIL Could not get snapshot, will try '
+                                  'for new snapshot in 30 seconds')
+                await asyncio.sleep(30)
 
-        # Get the page count and the page 0 lastUpdated field
-        try:
-            page0 = await get_page(0)
-            page_count = page0['totalPages']
-            page0_last_update = datetime.fromtimestamp(page0['lastUpdated']
-                                                       / 1000)
-        except (ResponseCodeError, UnexpectedUpdateError):
-            logging.exception('FAIL Could not get page 0, will try '
-                              'again in 30 seconds')
-            await asyncio.sleep(30)
-            return await self.get_active_auctions()
-
-        # Wait until ideal time
-        now_time = datetime.now()
-        ideal_time = page0_last_update + timedelta(seconds=AA_IDEAL_DELAY)
-
-        # If ideal time is already passed, try to get the next snapshot
-        if now_time > ideal_time:
-            diff_minutes = (now_time - ideal_time).total_seconds() / 60
-            delta = timedelta(minutes=math.ceil(diff_minutes))
-            page0_last_update += delta
-            ideal_time += delta
-        logging.info(f'Waiting until next ideal time '
-                     f'{ideal_time.strftime("%-I:%M:%S %p")} to capture '
-                     f'snapshot with timestamp '
-                     f'{page0_last_update.strftime("%-I:%M:%S %p")}')
-        await asyncio.sleep((ideal_time - now_time).total_seconds())
-
-        # Get a snapshot
-        try:
-            tasks = (get_page(p) for p in range(page_count))
-            bodies = await asyncio.gather(*tasks)
-            auctions = list(itertools.chain.from_iterable(
-                body['auctions'] for body in bodies
-            ))
-            logging.debug(f'OK got active auctions snapshot with timestamp '
-                          f'{page0_last_update.strftime("%-I:%M:%S %p")}')
-            return page0_last_update, auctions
-        except (ResponseCodeError, UnexpectedUpdateError):
-            logging.exception('FAIL Could not get snapshot, will try '
-                              'for new snapshot in 30 seconds')
-            await asyncio.sleep(30)
-            return await self.get_active_auctions()
+    def _assemble_snapshot(self, update_ms: int,
+                           pages: List[List[Dict[str, Any]]],
+                           page_count: int) \
+            -> Tuple[datetime, List[Dict[str, Any]]]:
+        """
+        Flatten gathered pages into one snapshot and record its metadata so
+        the next call can predict the following update.
+
+        :param update_ms: The millisecond lastUpdated timestamp of the
+        snapshot.
+        :param pages: The per-page lists of auction dictionaries.
+        :param page_count: The number of pages in the snapshot.
+        :return: Pair containing the lastUpdated timestamp and the
+        corresponding list of active auctions.
+        """
+        # Flatten with a single allocation of the final size instead of
+        # growing a list page by page
+        total = sum(len(page) for page in pages)
+        auctions: List[Dict[str, Any]] = [None] * total
+        i = 0
+        for page_auctions in pages:
+            auctions[i:i + len(page_auctions)] = page_auctions
+            i += len(page_auctions)
+        self._last_update_ms = update_ms
+        self._last_page_count = page_count
+        last_update = datetime.fromtimestamp(update_ms / 1000)
+        logger.debug('OK got active auctions snapshot with timestamp %s',
+                     last_update)
+        return last_update, auctions
 
     async def get_ended_auctions(self) -> Tuple[datetime, List[Dict[str, Any]]]:
         """
@@ -209,18 +373,28 @@ class SkyblockAPI:
         :return: Pair containing the timestamp and the list of recently ended
         auctions.
         """
-        logging.debug('Attempting to get ended auctions')
-        async with self._session.get(ENDED_AUCTIONS_URL) as res:
-            if res.status != 200:
-                logging.debug('FAIL could not get ended auctions, will try '
-                              'again in 30 seconds')
+        logger.debug('Attempting to get ended auctions')
+        while True:
+            # The session-wide timeout surfaces hung requests as
+            # asyncio.TimeoutError; treat them like a bad status code and
+            # fall back to the retry sleep
+            try:
+                async with self._session.get(ENDED_AUCTIONS_URL) as res:
+                    if res.status != 200:
+                        logger.debug('FAIL could not get ended auctions, '
+                                     'will try again in 30 seconds')
+                        await asyncio.sleep(30)
+                        continue
+                    body = orjson.loads(await res.read())
+            except asyncio.TimeoutError:
+                logger.debug('FAIL timed out getting ended auctions, will '
+                             'try again in 30 seconds')
                 await asyncio.sleep(30)
-                return await self.get_active_auctions()
-            body = await res.json()
+                continue
             last_update = datetime.fromtimestamp(body['lastUpdated'] / 1000)
             auctions = body['auctions']
-            logging.debug(f'OK got ended auctions with timestamp '
-                          f'{last_update.strftime("%-I:%M:%S %p")}')
+            logger.debug('OK got ended auctions with timestamp %s',
+                         last_update)
             return last_update, auctions
 
     async def get_bazaar_products(self) -> Tuple[datetime, Dict[str, Any]]:
@@ -230,18 +404,25 @@ class SkyblockAPI:
         :return: Pair containing the timestamp and a dict containing bazaar
         products.
         """
-        logging.debug('Attempting to get bazaar products')
-        async with self._session.get(BAZAAR_URL) as res:
-            if res.status != 200:
-                logging.debug('FAIL could not get bazaar products, will try '
-                              'again in 30 seconds')
+        logger.debug('Attempting to get bazaar products')
+        while True:
+            try:
+                async with self._session.get(BAZAAR_URL) as res:
+                    if res.status != 200:
+                        logger.debug('FAIL could not get bazaar products, '
+                                     'will try again in 30 seconds')
+                        await asyncio.sleep(30)
+                        continue
+                    body = orjson.loads(await res.read())
+            except asyncio.TimeoutError:
+                logger.debug('FAIL timed out getting bazaar products, will '
+                             'try again in 30 seconds')
                 await asyncio.sleep(30)
-                return await self.get_bazaar_products()
-            body = await res.json()
+                continue
             last_update = datetime.fromtimestamp(body['lastUpdated'] / 1000)
             products = body['products']
-            logging.debug(f'OK got bazaar products with timestamp '
-                          f'{last_update.strftime("%-I:%M:%S %p")}')
+            logger.debug('OK got bazaar products with timestamp %s',
+                         last_update)
             return last_update, products
 
 
@@ -1,29 +1,64 @@
 import functools
 import logging
 import sqlite3
-import statistics
-from configparser import ConfigParser
+import threading
+from collections import Counter, defaultdict
+from itertools import groupby
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Callable
 
-from fuzzywuzzy import process
+from rapidfuzz import fuzz, process, utils
 
 from backend import constants
+from backend.config import CONFIG
 from backend.controllers.auctionhouse import AuctionHouse
 from models.auction import ActiveAuction
 from models.dashboard import Dashboard
 
 _here = Path(__file__).parent
-_cfg = ConfigParser()
-_cfg.read(_here.parent.parent / 'config/spiggy.ini')
 
 
-_conn = sqlite3.connect(_here/'database.db',
-                        detect_types=sqlite3.PARSE_DECLTYPES)
+# Single read-write connection, used only by the save_*/delete_* writers.
+# check_same_thread is disabled because the AuctionHouse event emitter runs
+# sync handlers (the save_* functions below) in a thread executor; writes are
+# serialized through _write_lock in db_write. Reads go through per-thread
+# read-only connections (see _read_conn) so they never queue behind a flush.
+_conn = sqlite3.connect(_here/'database.db', check_same_thread=False,
+                        cached_statements=256)
+_write_lock = threading.Lock()
+_reader_local = threading.local()
 _conn.execute('PRAGMA foreign_keys = ON')
+# WAL keeps readers unblocked during the periodic batch flushes and replaces
+# the rollback-journal rewrite + full fsync per commit with an append to the
+# write-ahead log; synchronous=NORMAL is durable enough under WAL. The
+# -wal/-shm sidecar files next to database.db are expected.
+_conn.execute('PRAGMA journal_mode = WAL')
+_conn.execute('PRAGMA synchronous = NORMAL')
+_conn.execute('PRAGMA temp_store = MEMORY')
+_conn.execute('PRAGMA cache_size = -65536')
+_conn.execute('PRAGMA mmap_size = 268435456')
+
+
+def _read_conn() -> sqlite3.Connection:
+    """
+    Get the calling thread's read-only connection, opening it on first use.
+
+    The writer connection above has created the database file by the time
+    this runs, and WAL lets these readers proceed while a flush is in
+    progress.
+
+    :return: The calling thread's read-only connection.
+    """
+    conn = getattr(_reader_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(f'file:{_here/"database.db"}?mode=ro',
+                               uri=True, cached_statements=256)
+        conn.execute('PRAGMA mmap_size = 268435456')
+        _reader_local.conn = conn
+    return conn
 
-WRITE_TO_DATABASE = _cfg['Database'].getboolean('WriteToDatabase')
+WRITE_TO_DATABASE = CONFIG.write_to_database
 
 
 def db_write(func: Callable) -> Callable:
@@ -34,28 +69,121 @@ def db_write(func: Callable) -> Callable:
     :param func:
     :return:
     """
+    # The flag is fixed at import, so the check happens once here rather
+    # than on every call: disabled writers decorate to a no-op
+    if not WRITE_TO_DATABASE:
+        return functools.wraps(func)(lambda *args, **kwargs: None)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        if WRITE_TO_DATABASE:
+        with _write_lock:
             func(*args, **kwargs)
-            logging.info('OK wrote to database')
             _conn.commit()
+        logging.info('OK wrote to database')
     return wrapper
 
 
-# Table which tracks the lowest BIN history of a (item ID, rarity) pair
-_conn.execute(
+# The whole schema goes through one executescript call so module import runs
+# a single implicit transaction instead of one fsync per DDL statement.
+# Timestamps are stored as integer Unix epochs; integer comparisons in the
+# indexes are much cheaper than the text comparisons CURRENT_TIMESTAMP would
+# give, and reads skip per-row datetime parsing. The composite history
+# indexes cover the (item ID, rarity, timestamp >= ?) range scan and return
+# rows in timestamp order, so history queries need neither a post-lookup
+# filter nor a temporary sort.
+_SCHEMA_DDL = (
+    # Table which tracks the lowest BIN history of a (item ID, rarity) pair
     'CREATE TABLE IF NOT EXISTS lbin_history ('
-    '  timestamp      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,'
+    '  timestamp      INTEGER,'
     '  item_id        TEXT,'
     '  rarity         TEXT,'
     '  price          REAL'
-    ')'
-)
-_conn.execute(
-    'CREATE INDEX IF NOT EXISTS lbin_history_idx '
-    'ON lbin_history(item_id, rarity)'
+    ');'
+    # One-time migration for databases created before the epoch switch:
+    # CREATE TABLE IF NOT EXISTS leaves old TEXT timestamp rows in place,
+    # and TEXT sorts above every INTEGER, so without this rewrite the
+    # BETWEEN bounds would silently exclude all pre-upgrade history
+    # The 'utc' modifier is needed because the old rows were bound from
+    # datetime.now() as local-time strings
+    "UPDATE lbin_history "
+    "SET timestamp = CAST(strftime('%s', timestamp, 'utc') AS INTEGER) "
+    "WHERE typeof(timestamp) = 'text';"
+    'DROP INDEX IF EXISTS lbin_history_idx;'
+    'CREATE INDEX IF NOT EXISTS lbin_history_ts_idx '
+    'ON lbin_history(item_id, rarity, timestamp);'
+
+    # Table which tracks the average sale history of a (item ID, rarity) pair
+    'CREATE TABLE IF NOT EXISTS avg_sale_history ('
+    '  timestamp      INTEGER,'
+    '  item_id        TEXT,'
+    '  rarity         TEXT,'
+    '  price          REAL'
+    ');'
+    "UPDATE avg_sale_history "
+    "SET timestamp = CAST(strftime('%s', timestamp, 'utc') AS INTEGER) "
+    "WHERE typeof(timestamp) = 'text';"
+    'DROP INDEX IF EXISTS avg_sale_history_idx;'
+    'CREATE INDEX IF NOT EXISTS avg_sale_history_ts_idx '
+    'ON avg_sale_history(item_id, rarity, timestamp);'
+
+    # Table which tracks bazaar price history
+    'CREATE TABLE IF NOT EXISTS bazaar_history ('
+    '  timestamp      INTEGER,'
+    '  item_id        TEXT,'
+    '  buy_price      REAL,'
+    '  sell_price     REAL,'
+    '  buy_volume     REAL,'
+    '  sell_volume    REAL'
+    ');'
+    'CREATE INDEX IF NOT EXISTS bazaar_history_idx '
+    'ON bazaar_history(item_id);'
+
+    # Table which maps item IDs to base names and occurrences in different
+    # rarities
+    'CREATE TABLE IF NOT EXISTS item_info ('
+    '  item_id        TEXT UNIQUE,'
+    '  base_name      TEXT,'
+    '  common_ct      INTEGER DEFAULT 0,'
+    '  uncommon_ct    INTEGER DEFAULT 0,'
+    '  rare_ct        INTEGER DEFAULT 0,'
+    '  epic_ct        INTEGER DEFAULT 0,'
+    '  legendary_ct   INTEGER DEFAULT 0,'
+    '  mythic_ct      INTEGER DEFAULT 0,'
+    '  supreme_ct     INTEGER DEFAULT 0,'
+    '  special_ct     INTEGER DEFAULT 0,'
+    '  v_special_ct   INTEGER DEFAULT 0,'
+    '  unknown_ct     INTEGER DEFAULT 0'
+    ');'
+
+    # Table which stores information about each dashboard
+    'CREATE TABLE IF NOT EXISTS dashboard ('
+    '  message_id     INTEGER PRIMARY KEY,'
+    '  channel_id     INTEGER,'
+    '  title          TEXT,'
+    '  description    TEXT'
+    ');'
+
+    # Table which stores the dashboard items that need to be maintained
+    'CREATE TABLE IF NOT EXISTS dashboard_item ('
+    '  message_id_fk  INTEGER,'
+    '  item_id        TEXT,'
+    '  rarity         TEXT,'
+    '  FOREIGN KEY (message_id_fk) REFERENCES dashboard (message_id)'
+    '  ON DELETE CASCADE'
+    ');'
 )
+_conn.executescript(_SCHEMA_DDL)
+
+
+# Hot-path SQL lives at module scope so every call presents the identical
+# string to the connection's statement cache
+_SQL_INSERT_LBIN = 'INSERT INTO lbin_history VALUES (?, ?, ?, ?)'
+# Both timestamp endpoints are bound so the index range scan stops at "now"
+# instead of running to the end of the item's history
+_SQL_SELECT_LBIN = 'SELECT timestamp, price FROM lbin_history ' \
+                   'WHERE item_id = ? AND rarity = ? ' \
+                   'AND timestamp BETWEEN ? AND ? ' \
+                   'ORDER BY timestamp'
 
 
 @db_write
@@ -67,10 +195,14 @@ def save_lbin_history(ah: AuctionHouse) -> None:
     :param ah: The AuctionHouse instance to use.
     :return: None.
     """
-    sql = 'INSERT INTO lbin_history VALUES (?, ?, ?, ?)'
-    now = datetime.now()
-    for (item_id, rarity), prices in ah.lbin_buffer.items():
-        _conn.execute(sql, (now, item_id, rarity, statistics.mean(prices)))
+    now = int(datetime.now().timestamp())
+    # One prepared statement bound N times instead of N execute round-trips.
+    # sum/len instead of statistics.mean, which does exact-fraction
+    # accumulation and is an order of magnitude slower on float lists
+    _conn.executemany(_SQL_INSERT_LBIN,
+                      ((now, item_id, rarity, sum(prices) / len(prices))
+                       for (item_id, rarity), prices
+                       in ah.lbin_buffer.items()))
 
 
 def get_lbin_history(item_id: str, rarity: str,
@@ -84,26 +216,19 @@ def get_lbin_history(item_id: str, rarity: str,
     :param span: The timespan of the data to be returned.
     :return: None.
     """
-    sql = 'SELECT timestamp, price FROM lbin_history ' \
-          'WHERE item_id = ? AND rarity = ? AND timestamp >= ? ' \
-          'ORDER BY timestamp'
-    min_time = datetime.now() - span
-    return _conn.execute(sql, (item_id, rarity, min_time)).fetchall()
+    max_time = datetime.now()
+    min_time = int((max_time - span).timestamp())
+    return [(datetime.fromtimestamp(ts), price) for ts, price
+            in _read_conn().execute(
+                _SQL_SELECT_LBIN,
+                (item_id, rarity, min_time, int(max_time.timestamp())))]
 
 
-# Table which tracks the average sale history of a (item ID, rarity) pair
-_conn.execute(
-    'CREATE TABLE IF NOT EXISTS avg_sale_history ('
-    '  timestamp      DATETIME DEFAULT CURRENT_TIMESTAMP,'
-    '  item_id        TEXT,'
-    '  rarity         TEXT,'
-    '  price          REAL'
-    ')'
-)
-_conn.execute(
-    'CREATE INDEX IF NOT EXISTS avg_sale_history_idx '
-    'ON avg_sale_history(item_id, rarity)'
-)
+_SQL_INSERT_AVG_SALE = 'INSERT INTO avg_sale_history VALUES (?, ?, ?, ?)'
+_SQL_SELECT_AVG_SALE = 'SELECT timestamp, price FROM avg_sale_history ' \
+                       'WHERE item_id = ? AND rarity = ? ' \
+                       'AND timestamp BETWEEN ? AND ? ' \
+                       'ORDER BY timestamp'
 
 
 @db_write
@@ -115,10 +240,11 @@ def save_avg_sale_history(ah: AuctionHouse) -> None:
     :param ah: The AuctionHouse instance to use.
     :return: None.
     """
-    sql = 'INSERT INTO avg_sale_history VALUES (?, ?, ?, ?)'
-    now = datetime.now()
-    for (item_id, rarity), prices in ah.sale_buffer.items():
-        _conn.execute(sql, (now, item_id, rarity, statistics.mean(prices)))
+    now = int(datetime.now().timestamp())
+    _conn.executemany(_SQL_INSERT_AVG_SALE,
+                      ((now, item_id, rarity, sum(prices) / len(prices))
+                       for (item_id, rarity), prices
+                       in ah.sale_buffer.items()))
 
 
 def get_avg_sale_history(item_id: str, rarity: str,
@@ -132,49 +258,73 @@ def get_avg_sale_history(item_id: str, rarity: str,
     :param span: The timespan of the data to be returned.
     :return: None.
     """
-    sql = 'SELECT timestamp, price FROM avg_sale_history ' \
-          'WHERE item_id = ? AND rarity = ? AND timestamp >= ? ' \
-          'ORDER BY timestamp'
-    min_time = datetime.now() - span
-    return _conn.execute(sql, (item_id, rarity, min_time)).fetchall()
+    max_time = datetime.now()
+    min_time = int((max_time - span).timestamp())
+    return [(datetime.fromtimestamp(ts), price) for ts, price
+            in _read_conn().execute(
+                _SQL_SELECT_AVG_SALE,
+                (item_id, rarity, min_time, int(max_time.timestamp())))]
+
+
+# Rarity names in display order, precomputed once so guess_rarity doesn't
+# rebuild the key view on every call
+_RARITIES = tuple(constants.DISPLAY_RARITIES)
+
+_RARITY_COLS = 'common_ct, uncommon_ct, rare_ct, epic_ct, legendary_ct, ' \
+               'mythic_ct, supreme_ct, special_ct, v_special_ct, unknown_ct'
+
+_RARITY_COL_NAMES = {
+    'COMMON': 'common_ct',
+    'UNCOMMON': 'uncommon_ct',
+    'RARE': 'rare_ct',
+    'EPIC': 'epic_ct',
+    'LEGENDARY': 'legendary_ct',
+    'MYTHIC': 'mythic_ct',
+    'SUPREME': 'supreme_ct',
+    'SPECIAL': 'special_ct',
+    'VERY_SPECIAL': 'v_special_ct',
+    'UNKNOWN': 'unknown_ct'
+}
+_SQL_UPSERT_ITEM_INFO = \
+    'INSERT INTO item_info (item_id, base_name) VALUES (?, ?) ' \
+    'ON CONFLICT (item_id) DO UPDATE SET base_name = ?'
+# One static count-update statement per rarity, built once so each flush
+# presents the same ten strings to the statement cache
+_SQL_BUMP_COUNT = {
+    rarity: f'UPDATE item_info SET {col} = {col} + ? WHERE item_id = ?'
+    for rarity, col in _RARITY_COL_NAMES.items()
+}
 
 
-# Table which tracks bazaar price history
-_conn.execute(
-    'CREATE TABLE IF NOT EXISTS bazaar_history ('
-    '  timestamp      DATETIME DEFAULT CURRENT_TIMESTAMP,'
-    '  item_id        TEXT,'
-    '  buy_price      REAL,'
-    '  sell_price     REAL,'
-    '  buy_volume     REAL,'
-    '  sell_volume    REAL'
-    ')'
-)
-_conn.execute(
-    'CREATE INDEX IF NOT EXISTS bazaar_history_idx '
-    'ON bazaar_history(item_id)'
-)
+@db_write
+def _write_item_info(ah: AuctionHouse) -> None:
+    """
+    Write the item info rows for save_item_info; db_write commits on return.
 
-# Table which maps item IDs to base names and occurrences in different rarities
-_conn.execute(
-    'CREATE TABLE IF NOT EXISTS item_info ('
-    '  item_id        TEXT UNIQUE,'
-    '  base_name      TEXT,'
-    '  common_ct      INTEGER DEFAULT 0,'
-    '  uncommon_ct    INTEGER DEFAULT 0,'
-    '  rare_ct        INTEGER DEFAULT 0,'
-    '  epic_ct        INTEGER DEFAULT 0,'
-    '  legendary_ct   INTEGER DEFAULT 0,'
-    '  mythic_ct      INTEGER DEFAULT 0,'
-    '  supreme_ct     INTEGER DEFAULT 0,'
-    '  special_ct     INTEGER DEFAULT 0,'
-    '  v_special_ct   INTEGER DEFAULT 0,'
-    '  unknown_ct     INTEGER DEFAULT 0'
-    ')'
-)
+    :param ah: The AuctionHouse instance to use.
+    :return: None.
+    """
+    # Aggregate in Python first; the snapshot collapses into one upsert per
+    # distinct item and one batched count update per rarity, instead of two
+    # statements per auction
+    base_names = {}
+    counts = Counter()
+    for auction in ah.active_auctions:
+        item = auction.item
+        base_names[item.item_id] = item.base_name
+        counts[(item.item_id, item.rarity)] += 1
+
+    _conn.executemany(_SQL_UPSERT_ITEM_INFO,
+                      ((item_id, base_name, base_name)
+                       for item_id, base_name in base_names.items()))
+
+    deltas = defaultdict(list)
+    for (item_id, rarity), count in counts.items():
+        deltas[rarity].append((count, item_id))
+    for rarity, rows in deltas.items():
+        _conn.executemany(_SQL_BUMP_COUNT[rarity], rows)
 
 
-@db_write
 def save_item_info(ah: AuctionHouse) -> None:
     """
     Update the item info from the given AuctionHouse object's active auctions.
@@ -182,31 +332,39 @@ def save_item_info(ah: AuctionHouse) -> None:
     :param ah: The AuctionHouse instance to use.
     :return: None.
     """
-    sql = 'INSERT INTO item_info (item_id, base_name) VALUES (?, ?) ' \
-          'ON CONFLICT (item_id) DO UPDATE SET base_name = ?'
-    col_names = {
-        'COMMON': 'common_ct',
-        'UNCOMMON': 'uncommon_ct',
-        'RARE': 'rare_ct',
-        'EPIC': 'epic_ct',
-        'LEGENDARY': 'legendary_ct',
-        'MYTHIC': 'mythic_ct',
-        'SUPREME': 'supreme_ct',
-        'SPECIAL': 'special_ct',
-        'VERY_SPECIAL': 'v_special_ct',
-        'UNKNOWN': 'unknown_ct'
-    }
+    global _name_cache
+    _write_item_info(ah)
+    # Invalidate only after the write has committed; dropping the cache
+    # before the commit would let a racing lookup rebuild it from the
+    # pre-write snapshot and keep it stale until the next flush
+    _name_cache = None
 
-    for auction in ah.active_auctions:
-        item_id = auction.item.item_id
-        base_name = auction.item.base_name
-        rarity = auction.item.rarity
-        # Create new row or update the base name for an existing row
-        _conn.execute(sql, (item_id, base_name, base_name))
-        # Update the count
-        col_name = col_names[rarity]
-        _conn.execute(f'UPDATE item_info SET {col_name} = {col_name} + 1 '
-                      f'WHERE item_id = ?', (item_id,))
+
+# Fuzzy-match choices (raw and pre-normalized) and the base name -> item ID
+# map, cached between item_info writes so lookups don't rescan the table or
+# re-normalize every candidate per call
+_name_cache: Optional[Tuple[List[str], List[str], Dict[str, str]]] = None
+
+
+def _get_name_cache() -> Tuple[List[str], List[str], Dict[str, str]]:
+    """
+    Get the cached fuzzy-match choices, rebuilding them from item_info if a
+    write has invalidated the cache. Base names are normalized once here so
+    matching can run with processor=None.
+
+    :return: Triple containing the list of base names, their normalized
+    forms, and the map from base name to item ID.
+    """
+    global _name_cache
+    if _name_cache is None:
+        choices, id_map = [], {}
+        sql = 'SELECT base_name, item_id FROM item_info'
+        for base_name, item_id in _read_conn().execute(sql):
+            choices.append(base_name)
+            id_map[base_name] = item_id
+        processed = [utils.default_process(name) for name in choices]
+        _name_cache = (choices, processed, id_map)
+    return _name_cache
 
 
 def guess_rarity(item_id: str) -> Optional[str]:
@@ -218,14 +376,16 @@ def guess_rarity(item_id: str) -> Optional[str]:
     :param item_id: The item ID to guess with.
     :return: The guess of the rarity.
     """
-    sql = 'SELECT * FROM item_info WHERE item_id = ?'
-    rarities = constants.DISPLAY_RARITIES.keys()
-    counts = _conn.execute(sql, (item_id,)).fetchone()[2:12]
+    # Explicit count columns: no TEXT columns to materialize, and no brittle
+    # positional slice to break when the schema grows
+    sql = f'SELECT {_RARITY_COLS} FROM item_info WHERE item_id = ?'
+    counts = _read_conn().execute(sql, (item_id,)).fetchone()
 
     if item_id.endswith('_PET'):
-        return max(zip(rarities, counts), key=lambda tp: tp[1])[0]
+        return max(zip(_RARITIES, counts), key=lambda tp: tp[1])[0]
     else:
-        non_zero_rarities = [(r, c) for r, c in zip(rarities, counts) if c > 0]
+        non_zero_rarities = [(r, c) for r, c
+                             in zip(_RARITIES, counts) if c > 0]
         return non_zero_rarities[0][0]
 
 
@@ -237,12 +397,38 @@ def guess_identifiers(fuzzy_base_name: str) -> Tuple[str, str]:
     :param fuzzy_base_name: The base name to be matched.
     :return: The identifier pair with the closest matching base name.
     """
-    sql = 'SELECT base_name FROM item_info'
-    choices = _conn.execute(sql).fetchall()
-    base_name = process.extractOne(fuzzy_base_name, choices)[0][0]
-    sql2 = 'SELECT item_id FROM item_info WHERE base_name = ?'
-    item_id = _conn.execute(sql2, (base_name,)).fetchone()[0]
-    return item_id, base_name
+    choices, processed, id_map = _get_name_cache()
+    # The query is normalized here and the choices at cache-build time, so
+    # the scorer skips per-candidate normalization
+    _, _, index = process.extractOne(utils.default_process(fuzzy_base_name),
+                                     processed, scorer=fuzz.WRatio,
+                                     processor=None)
+    base_name = choices[index]
+    return id_map[base_name], base_name
+
+
+def guess_identifiers_many(fuzzy_base_names: List[str]) \
+        -> List[Tuple[str, str]]:
+    """
+    Given several fuzzy base names, guess the corresponding (item ID, base
+    name) identifier pair for each of them.
+
+    The whole query-by-choice similarity matrix is computed in one C call
+    across all cores, which is much faster than looping extractOne per name.
+
+    :param fuzzy_base_names: The base names to be matched.
+    :return: The identifier pairs with the closest matching base names, in
+    the order the fuzzy names were given.
+    """
+    choices, processed, id_map = _get_name_cache()
+    queries = [utils.default_process(name) for name in fuzzy_base_names]
+    scores = process.cdist(queries, processed, scorer=fuzz.WRatio,
+                           processor=None, workers=-1)
+    results = []
+    for index in scores.argmax(axis=1):
+        base_name = choices[index]
+        results.append((id_map[base_name], base_name))
+    return results
 
 
 def get_base_name(item_id: str) -> Optional[str]:
@@ -254,32 +440,10 @@ def get_base_name(item_id: str) -> Optional[str]:
     :return: The corresponding base name of the item, if it exists.
     """
     sql = 'SELECT base_name FROM item_info WHERE item_id = ?'
-    ret = _conn.execute(sql, (item_id,)).fetchone()
+    ret = _read_conn().execute(sql, (item_id,)).fetchone()
     return ret[0] if ret is not None else None
 
 
-# Table which stores information about each dashboard
-_conn.execute(
-    'CREATE TABLE IF NOT EXISTS dashboard ('
-    '  message_id     INTEGER PRIMARY KEY,'
-    '  channel_id     INTEGER,'
-    '  title          TEXT,'
-    '  description    TEXT'
-    ')'
-)
-
-# Table which stores the dashboard items that need to be maintained
-_conn.execute(
-    'CREATE TABLE IF NOT EXISTS dashboard_item ('
-    '  message_id_fk  INTEGER,'
-    '  item_id        TEXT,'
-    '  rarity         TEXT,'
-    '  FOREIGN KEY (message_id_fk) REFERENCES dashboard (message_id)'
-    '  ON DELETE CASCADE'
-    ')'
-)
-
-
 @db_write
 def save_dashboard(dashboard: Dashboard) -> None:
     """
@@ -298,20 +462,24 @@ def save_dashboard(dashboard: Dashboard) -> None:
 
 
 def get_dashboards() -> List[Dashboard]:
-    # Map each message ID to a Dashboard instance
-    dashboards = {}
-    for row in _conn.execute('SELECT * FROM dashboard'):
-        message_id, channel_id, title, description = row
-        dashboards[message_id] = Dashboard(items=[], message_id=message_id,
-                                           channel_id=channel_id, title=title,
-                                           description=description)
-
-    # Add the items to each dashboard
-    for row in _conn.execute('SELECT * FROM dashboard_item'):
-        message_id, item_id, rarity = row
-        dashboards[message_id].items.append((item_id, rarity))
-
-    return list(dashboards.values())
+    # One LEFT JOIN ordered by message ID brings each dashboard's rows back
+    # adjacent, so a single streaming pass builds the Dashboard instances
+    # without a second query or per-item dict lookups
+    sql = 'SELECT d.message_id, d.channel_id, d.title, d.description, ' \
+          '       di.item_id, di.rarity ' \
+          'FROM dashboard d ' \
+          'LEFT JOIN dashboard_item di ON di.message_id_fk = d.message_id ' \
+          'ORDER BY d.message_id'
+    dashboards = []
+    for _, rows in groupby(_read_conn().execute(sql), key=lambda r: r[0]):
+        rows = list(rows)
+        message_id, channel_id, title, description = rows[0][:4]
+        items = [(item_id, rarity) for _, _, _, _, item_id, rarity in rows
+                 if item_id is not None]
+        dashboards.append(Dashboard(items=items, message_id=message_id,
+                                    channel_id=channel_id, title=title,
+                                    description=description))
+    return dashboards
 
 
 @db_write
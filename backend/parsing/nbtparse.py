@@ -18,29 +18,36 @@ with open(_here/'exceptions/reforges.json') as f:
     REFORGE_EXCEPTIONS = json.load(f)
 
 
+# Pre-built Struct objects; unpack on these is a single C call per tag,
+# where int.from_bytes pays a Python method call on every numeric tag of
+# every auction
+_STRUCT_BYTE = struct.Struct('>b')
+_STRUCT_USHORT = struct.Struct('>H')
+_STRUCT_SHORT = struct.Struct('>h')
+_STRUCT_INT = struct.Struct('>i')
+_STRUCT_LONG = struct.Struct('>q')
+_STRUCT_FLOAT = struct.Struct('>f')
+_STRUCT_DOUBLE = struct.Struct('>d')
+
+
 def _pop_byte(bytes_f: BinaryIO) -> int:
-    return int.from_bytes(bytes_f.read(1),
-                          byteorder='big', signed=True)
+    return _STRUCT_BYTE.unpack(bytes_f.read(1))[0]
 
 
 def _pop_ushort(bytes_f: BinaryIO) -> int:
-    return int.from_bytes(bytes_f.read(2),
-                          byteorder='big', signed=False)
+    return _STRUCT_USHORT.unpack(bytes_f.read(2))[0]
 
 
 def _pop_short(bytes_f: BinaryIO) -> int:
-    return int.from_bytes(bytes_f.read(2),
-                          byteorder='big', signed=True)
+    return _STRUCT_SHORT.unpack(bytes_f.read(2))[0]
 
 
 def _pop_int(bytes_f: BinaryIO) -> int:
-    return int.from_bytes(bytes_f.read(4),
-                          byteorder='big', signed=True)
+    return _STRUCT_INT.unpack(bytes_f.read(4))[0]
 
 
 def _pop_long(bytes_f: BinaryIO) -> int:
-    return int.from_bytes(bytes_f.read(8),
-                          byteorder='big', signed=True)
+    return _STRUCT_LONG.unpack(bytes_f.read(8))[0]
 
 
 def _pop_string(bytes_f: BinaryIO) -> str:
@@ -97,18 +104,18 @@ def parse_long(bytes_f: BinaryIO, read_name: bool = True) -> NbtTag:
 
 def parse_float(bytes_f: BinaryIO, read_name: bool = True) -> NbtTag:
     name = _pop_string(bytes_f) if read_name else ''
-    return NbtTag(name, struct.unpack('>f', bytes_f.read(4)))
+    return NbtTag(name, _STRUCT_FLOAT.unpack(bytes_f.read(4))[0])
 
 
 def parse_double(bytes_f: BinaryIO, read_name: bool = True) -> NbtTag:
     name = _pop_string(bytes_f) if read_name else ''
-    return NbtTag(name, struct.unpack('>d', bytes_f.read(8)))
+    return NbtTag(name, _STRUCT_DOUBLE.unpack(bytes_f.read(8))[0])
 
 
 def parse_byte_array(bytes_f: BinaryIO, read_name: bool = True) -> NbtTag:
     name = _pop_string(bytes_f) if read_name else ''
     payload = _pop_int(bytes_f)
-    arr = [_pop_byte(bytes_f) for _ in range(payload)]
+    arr = list(struct.unpack(f'>{payload}b', bytes_f.read(payload)))
     return NbtTag(name, arr)
 
 
@@ -141,14 +148,14 @@ def parse_compound(bytes_f: BinaryIO, read_name: bool = True) -> NbtTag:
 def parse_int_array(bytes_f: BinaryIO, read_name: bool = True) -> NbtTag:
     name = _pop_string(bytes_f) if read_name else ''
     payload = _pop_int(bytes_f)
-    arr = [_pop_int(bytes_f) for _ in range(payload)]
+    arr = list(struct.unpack(f'>{payload}i', bytes_f.read(4 * payload)))
     return NbtTag(name, arr)
 
 
 def parse_long_array(bytes_f: BinaryIO, read_name: bool = True) -> NbtTag:
     name = _pop_string(bytes_f) if read_name else ''
     payload = _pop_int(bytes_f)
-    arr = [_pop_long(bytes_f) for _ in range(payload)]
+    arr = list(struct.unpack(f'>{payload}q', bytes_f.read(8 * payload)))
     return NbtTag(name, arr)
 
 
@@ -169,6 +176,15 @@ PARSERS = [
 ]
 
 
+# Compiled once; this runs on every display name and lore line extracted
+# from every auction, where re.sub with a string pattern would pay a cache
+# lookup per call
+_NBT_STYLE_RE = re.compile('§ka|§.')
+# Deleting a fixed set of codepoints needs no regex at all: str.translate
+# with this table is a single C pass over the name
+_SYMBOL_STRIP_TABLE = str.maketrans('', '', '✪⚚✦◆™©�')
+
+
 def _without_nbt_style(s: str) -> str:
     """
     Given a full string with NBT styling, return the string without coloring
@@ -177,7 +193,7 @@ def _without_nbt_style(s: str) -> str:
     :param s: The given string.
     :return: The given string without NBT styling.
     """
-    return re.sub('§ka|§.', '', s).strip()
+    return _NBT_STYLE_RE.sub('', s).strip()
 
 
 def deserialize(b64: str) -> NbtTag:
@@ -242,7 +258,8 @@ def extract_generic_base_name(nbt: NbtTag) -> str:
     :return: The name of the item with extra symbols removed and reforge
     dropped, if applicable.
     """
-    name = re.sub('[✪⚚✦◆™©�]', '', extract_generic_display_name(nbt)).strip()
+    name = extract_generic_display_name(nbt) \
+        .translate(_SYMBOL_STRIP_TABLE).strip()
     # No reforge, we are done
     if not extract_reforge(nbt):
         return name
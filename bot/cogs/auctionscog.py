@@ -1,4 +1,3 @@
-from configparser import ConfigParser
 from datetime import timedelta
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -9,17 +8,14 @@ from discord_slash import SlashCommandOptionType, SlashContext
 from discord_slash.utils.manage_commands import create_choice, create_option
 
 from backend import constants
+from backend.config import CONFIG
 from backend.controllers.auctionhouse import AuctionHouse
 from backend.database import database
 from bot import embeds, utils
 from bot.utils import cog_slash
 from models.dashboard import Dashboard
 
-_here = Path(__file__).parent
-_cfg = ConfigParser()
-_cfg.read(_here.parent.parent / 'config/spiggy.ini')
-
-DEFAULT_PLOT_SPAN = _cfg['Plotting'].getint('DefaultPlotSpan')
+DEFAULT_PLOT_SPAN = CONFIG.default_plot_span
 
 
 class AuctionsCog(Cog):
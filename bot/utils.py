@@ -2,7 +2,6 @@ import functools
 import inspect
 import math
 import statistics
-from configparser import ConfigParser
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Callable, Coroutine, List, Optional, Tuple, Union
@@ -15,16 +14,13 @@ from matplotlib import colors as mcolors, dates as mdates, pyplot as plt
 from matplotlib.patches import Polygon
 from matplotlib.ticker import FuncFormatter
 
+from backend.config import CONFIG
 from backend.controllers.auctionhouse import AuctionHouse
 from backend.database import database
 from bot import embeds
 
 
-_here = Path(__file__).parent
-_cfg = ConfigParser()
-_cfg.read(_here.parent / 'config/spiggy.ini')
-
-SLASH_COMMAND_GUILDS = _cfg['Bot'].get('SlashCommandGuilds')
+SLASH_COMMAND_GUILDS = CONFIG.slash_command_guilds
 
 if SLASH_COMMAND_GUILDS == '':
     # Register slash commands globally
@@ -1,5 +1,7 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
 
 from models.item import Item
 from models.user import User
@@ -9,12 +11,16 @@ class Auction:
     """
     Abstract class defining a Skyblock auction.
     """
+    __slots__ = ('auction_id', 'seller', 'is_bin', '_end_ms', 'price',
+                 'item', '_key')
+
     auction_id: str
     seller: User
     is_bin: bool
-    end_time: datetime
+    _end_ms: int
     price: float
     item: Item
+    _key: Tuple[str, str]
 
     @property
     def unit_price(self) -> float:
@@ -25,15 +31,30 @@ class Auction:
         """
         return self.price / self.item.stack_size
 
+    @property
+    def end_time(self) -> datetime:
+        """
+        Return the end time of the auction.
+
+        The raw millisecond timestamp from the API is kept as an int and the
+        datetime is only constructed on access, so auctions which are never
+        displayed don't pay for the conversion.
+
+        :return: The end time of the auction.
+        """
+        return datetime.fromtimestamp(self._end_ms / 1000)
+
 
 class EndedAuction(Auction):
     """
     Class defining an auction which has already ended.
     """
+    __slots__ = ()
+
     auction_id: str
     seller: User
     is_bin: bool
-    end_time: datetime
+    _end_ms: int
     price: float
     item: Item
 
@@ -47,23 +68,28 @@ class EndedAuction(Auction):
         self.auction_id = d['auction_id']
         self.seller = User(d['seller'])
         self.is_bin = d['bin']
-        self.end_time = datetime.fromtimestamp(d['timestamp'] / 1000)
+        self._end_ms = d['timestamp']
         self.price = d['price']
         self.item = Item(d['item_bytes'])
+        # Cached once so buffer updates don't allocate a fresh tuple per
+        # auction per cycle
+        self._key = (self.item.item_id, self.item.rarity)
 
 
 class ActiveAuction(Auction):
     """
     Class defining an auction which has not yet ended.
     """
+    __slots__ = ('_start_ms', 'starting_price')
+
     auction_id: str
     seller: User
     is_bin: bool
-    end_time: datetime
+    _end_ms: int
     price: float
     item: Item
 
-    start_time: datetime
+    _start_ms: int
     starting_price: float
 
     def __init__(self, d: Dict[str, any]) -> None:
@@ -75,11 +101,62 @@ class ActiveAuction(Auction):
         self.auction_id = d['uuid']
         self.seller = User(d['auctioneer'])
         self.is_bin = 'bin' in d
-        self.end_time = datetime.fromtimestamp(d['end'] / 1000)
+        self._end_ms = d['end']
         if self.is_bin:
             self.price = d['starting_bid']
         else:
             self.price = d['highest_bid_amount']
         self.item = Item(d['item_bytes'])
-        self.start_time = datetime.fromtimestamp(d['start'] / 1000)
+        self._key = (self.item.item_id, self.item.rarity)
+        self._start_ms = d['start']
         self.starting_price = d['starting_bid']
+
+    @property
+    def start_epoch(self) -> float:
+        """
+        Return the start time of the auction as epoch seconds, for hot paths
+        that compare ages without building datetime objects.
+
+        :return: The start time of the auction in epoch seconds.
+        """
+        return self._start_ms / 1000
+
+    @property
+    def start_time(self) -> datetime:
+        """
+        Return the start time of the auction, constructed lazily from the raw
+        millisecond timestamp.
+
+        :return: The start time of the auction.
+        """
+        return datetime.fromtimestamp(self._start_ms / 1000)
+
+    @classmethod
+    def from_dicts(cls, dicts: List[Dict[str, Any]]) -> List['ActiveAuction']:
+        """
+        Construct a batch of ActiveAuction instances at once, dropping any
+        whose items have non-ASCII base names.
+
+        Parsing a whole batch in a single call lets worker processes pay the
+        pickle round-trip once per batch instead of once per auction, and
+        filtering here means rejects are never pickled back to the parent.
+
+        :param dicts: The dictionaries corresponding to the active auctions.
+        :return: The corresponding list of ActiveAuction instances.
+        """
+        return [auction for d in dicts
+                if (auction := cls(d)).item.has_ascii_base_name()]
+
+    @classmethod
+    def from_json(cls, buf: bytes) -> List['ActiveAuction']:
+        """
+        Construct a batch of ActiveAuction instances from JSON-encoded bytes.
+
+        Sending a flat bytes object to a worker process pickles as a single
+        memcpy, which is far cheaper than pickling a list of nested dicts;
+        the worker decodes with orjson on its side of the boundary.
+
+        :param buf: A JSON array of active auction dictionaries.
+        :return: The corresponding list of ActiveAuction instances.
+        """
+        return cls.from_dicts(orjson.loads(buf))
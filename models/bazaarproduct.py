@@ -5,6 +5,9 @@ class BazaarProduct:
     """
     Class defining bazaar product information at a point in time.
     """
+    __slots__ = ('item_id', 'buy_price', 'sell_price', 'buy_volume',
+                 'sell_volume')
+
     item_id: str
     buy_price: float
     sell_price: float
@@ -1,8 +1,48 @@
 import logging
-from typing import List, Optional, Tuple
+import sys
+from typing import Dict, List, Optional, Tuple
 
 from backend.parsing import nbtparse
 
+# Parsed attributes keyed by the hash of an item's base64 NBT payload. Many
+# auctions persist across snapshots with identical item_bytes, so their
+# (expensive) base64 + gzip + NBT decode can be reused from the previous
+# cycle. The cache is cleared when it hits the cap to bound memory.
+_parse_cache: Dict[int, Tuple] = {}
+_PARSE_CACHE_MAX = 1 << 18
+
+
+def _parse_attributes(b64: str) -> Tuple:
+    """
+    Decode an item's base64 NBT representation into the attribute tuple used
+    by Item, consulting the parse cache first.
+
+    :param b64: The base64 NBT representation of the item.
+    :return: A tuple with the extracted item attributes.
+    """
+    key = hash(b64)
+    cached = _parse_cache.get(key)
+    if cached is None:
+        nbt = nbtparse.deserialize(b64)
+        item_id, base_name, display_name = nbtparse.extract_identifiers(nbt)
+        # Item IDs and rarities come from a bounded vocabulary, so interning
+        # them makes downstream dict lookups on (item ID, rarity) keys
+        # compare by pointer instead of by character
+        cached = ((sys.intern(item_id), base_name, display_name),
+                  nbtparse.extract_stack_size(nbt),
+                  sys.intern(nbtparse.extract_rarity(nbt)),
+                  nbtparse.extract_rune(nbt),
+                  nbtparse.extract_enchants(nbt),
+                  nbtparse.extract_is_recombobulated(nbt),
+                  nbtparse.extract_is_fragged(nbt),
+                  nbtparse.extract_hot_potato_count(nbt),
+                  nbtparse.extract_reforge(nbt),
+                  nbtparse.extract_dungeon_stars(nbt))
+        if len(_parse_cache) >= _PARSE_CACHE_MAX:
+            _parse_cache.clear()
+        _parse_cache[key] = cached
+    return cached
+
 
 class Item:
     """
@@ -28,20 +68,11 @@ class Item:
 
         :return: None.
         """
-        nbt = nbtparse.deserialize(b64)
-
-        self.item_id, self.base_name, self.display_name = \
-            nbtparse.extract_identifiers(nbt)
-        self.stack_size = nbtparse.extract_stack_size(nbt)
-        self.rarity = nbtparse.extract_rarity(nbt)
-
-        self.rune = nbtparse.extract_rune(nbt)
-        self.enchants = nbtparse.extract_enchants(nbt)
-        self.is_recombobulated = nbtparse.extract_is_recombobulated(nbt)
-        self.is_fragged = nbtparse.extract_is_fragged(nbt)
-        self.hot_potato_count = nbtparse.extract_hot_potato_count(nbt)
-        self.reforge = nbtparse.extract_reforge(nbt)
-        self.dungeon_stars = nbtparse.extract_dungeon_stars(nbt)
+        (self.item_id, self.base_name, self.display_name), \
+            self.stack_size, self.rarity, self.rune, self.enchants, \
+            self.is_recombobulated, self.is_fragged, \
+            self.hot_potato_count, self.reforge, self.dungeon_stars = \
+            _parse_attributes(b64)
 
     def has_ascii_base_name(self) -> bool:
         """